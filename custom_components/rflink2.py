@@ -7,13 +7,16 @@ https://home-assistant.io/components/rflink/
 import asyncio
 from collections import defaultdict
 import logging
+import sys
+import time
 import async_timeout
 
 import voluptuous as vol
 
 from homeassistant.const import (
     ATTR_ENTITY_ID, CONF_COMMAND, CONF_HOST, CONF_PORT,
-    STATE_ON, EVENT_HOMEASSISTANT_STOP)
+    STATE_CLOSED, STATE_ON, STATE_OPEN, EVENT_HOMEASSISTANT_START,
+    EVENT_HOMEASSISTANT_STOP)
 from homeassistant.core import CoreState, callback
 from homeassistant.exceptions import HomeAssistantError
 import homeassistant.helpers.config_validation as cv
@@ -22,6 +25,7 @@ from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.dispatcher import (
     async_dispatcher_send, async_dispatcher_connect)
 from homeassistant.helpers.restore_state import RestoreEntity
+from homeassistant.helpers.storage import Store
 
 REQUIREMENTS = ['rflink==0.0.37']
 
@@ -29,7 +33,12 @@ _LOGGER = logging.getLogger(__name__)
 
 ATTR_EVENT = 'event'
 ATTR_STATE = 'state'
+ATTR_AGGREGATE_COUNT = 'aggregate_count'
+ATTR_AGGREGATE_LAST = 'aggregate_last'
+ATTR_AGGREGATE_MAX = 'aggregate_max'
+ATTR_AGGREGATE_MIN = 'aggregate_min'
 
+CONF_AGGREGATE_WINDOWS = 'aggregate_windows'
 CONF_ALIASES = 'aliases'
 CONF_ALIASSES = 'aliasses'
 CONF_GROUP_ALIASES = 'group_aliases'
@@ -38,15 +47,24 @@ CONF_GROUP = 'group'
 CONF_NOGROUP_ALIASES = 'nogroup_aliases'
 CONF_NOGROUP_ALIASSES = 'nogroup_aliasses'
 CONF_DEVICE_DEFAULTS = 'device_defaults'
+CONF_COMMANDS = 'commands'
 CONF_DEVICE_ID = 'device_id'
 CONF_DEVICES = 'devices'
+CONF_DIM_DEBOUNCE = 'dim_debounce'
+CONF_DIM_DEBOUNCE_LEADING = 'dim_debounce_leading'
+CONF_DIM_DEBOUNCE_TRAILING = 'dim_debounce_trailing'
 CONF_AUTOMATIC_ADD = 'automatic_add'
 CONF_FIRE_EVENT = 'fire_event'
 CONF_IGNORE_DEVICES = 'ignore_devices'
 CONF_RECONNECT_INTERVAL = 'reconnect_interval'
+CONF_REPETITIONS = 'repetitions'
 CONF_SIGNAL_REPETITIONS = 'signal_repetitions'
+CONF_TRAVEL_TIME_DOWN = 'travel_time_down'
+CONF_TRAVEL_TIME_UP = 'travel_time_up'
 CONF_WAIT_FOR_ACK = 'wait_for_ack'
 
+DATA_AGGREGATE_WINDOWS = 'rflink2_aggregate_windows'
+DATA_COVER_TRACKER = 'rflink2_cover_tracker'
 DATA_DEVICE_REGISTER = 'rflink_device_register'
 DATA_ENTITY_LOOKUP = 'rflink_entity_lookup'
 DATA_ENTITY_GROUP_LOOKUP = 'rflink_entity_group_only_lookup'
@@ -54,17 +72,42 @@ DEFAULT_RECONNECT_INTERVAL = 10
 DEFAULT_SIGNAL_REPETITIONS = 1
 CONNECTION_TIMEOUT = 10
 
+STATE_CACHE_MAX_AGE = 7 * 24 * 3600
+STATE_CACHE_MAX_SIZE = 500
+STATE_CACHE_SAVE_DELAY = 60
+STATE_CACHE_STORAGE_KEY = 'rflink2.state_cache'
+STATE_CACHE_STORAGE_VERSION = 1
+
 EVENT_BUTTON_PRESSED = 'button_pressed'
 EVENT_KEY_COMMAND = 'command'
 EVENT_KEY_ID = 'id'
+EVENT_KEY_RESTORED = 'restored'
 EVENT_KEY_SENSOR = 'sensor'
 EVENT_KEY_UNIT = 'unit'
+EVENT_KEY_VALUE = 'value'
+EVENT_SEND_COMMANDS_RESULT = 'rflink2_send_commands_result'
+
+ATTR_COLLAPSED = 'collapsed'
+ATTR_DURATION = 'duration'
+ATTR_DUPLICATES = 'duplicates'
+ATTR_FAILED = 'failed'
+ATTR_RESULTS = 'results'
+ATTR_SUCCESS = 'success'
+ATTR_CURRENT_POSITION = 'current_position'
+ATTR_POSITION = 'position'
+
+COVER_TRACKER_INTERVAL = 0.5
+COVER_STATE_STEP = 10
+COVER_UP_COMMANDS = ['up', 'on', 'allon']
+COVER_DOWN_COMMANDS = ['down', 'off', 'alloff']
+COVER_STOP_COMMANDS = ['stop']
 
 RFLINK_GROUP_COMMANDS = ['allon', 'alloff']
 
 DOMAIN = 'rflink2'
 
 SERVICE_SEND_COMMAND = 'send_command'
+SERVICE_SEND_COMMANDS = 'send_commands'
 
 SIGNAL_AVAILABILITY = 'rflink_device_available'
 SIGNAL_HANDLE_EVENT = 'rflink_handle_event_{}'
@@ -75,6 +118,14 @@ DEVICE_DEFAULTS_SCHEMA = vol.Schema({
     vol.Optional(CONF_FIRE_EVENT, default=False): cv.boolean,
     vol.Optional(CONF_SIGNAL_REPETITIONS,
                  default=DEFAULT_SIGNAL_REPETITIONS): vol.Coerce(int),
+    vol.Optional(CONF_DIM_DEBOUNCE):
+        vol.All(cv.time_period, cv.positive_timedelta),
+    vol.Optional(CONF_DIM_DEBOUNCE_LEADING, default=True): cv.boolean,
+    vol.Optional(CONF_DIM_DEBOUNCE_TRAILING, default=True): cv.boolean,
+    vol.Optional(CONF_TRAVEL_TIME_UP):
+        vol.All(cv.time_period, cv.positive_timedelta),
+    vol.Optional(CONF_TRAVEL_TIME_DOWN):
+        vol.All(cv.time_period, cv.positive_timedelta),
 })
 
 CONFIG_SCHEMA = vol.Schema({
@@ -86,6 +137,9 @@ CONFIG_SCHEMA = vol.Schema({
                      default=DEFAULT_RECONNECT_INTERVAL): int,
         vol.Optional(CONF_IGNORE_DEVICES, default=[]):
             vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(CONF_AGGREGATE_WINDOWS, default={}): {
+            cv.string: vol.All(cv.time_period, cv.positive_timedelta),
+        },
     }),
 }, extra=vol.ALLOW_EXTRA)
 
@@ -94,6 +148,41 @@ SEND_COMMAND_SCHEMA = vol.Schema({
     vol.Required(CONF_COMMAND): cv.string,
 })
 
+SEND_COMMANDS_SCHEMA = vol.Schema({
+    vol.Required(CONF_COMMANDS): vol.All(cv.ensure_list, [vol.Schema({
+        vol.Required(CONF_DEVICE_ID): cv.string,
+        vol.Required(CONF_COMMAND): cv.string,
+        vol.Optional(CONF_REPETITIONS, default=1):
+            vol.All(vol.Coerce(int), vol.Range(min=1)),
+    })]),
+})
+
+
+# Shared alias tuples, many devices tend to use identical alias lists
+_ALIASES_CACHE = {}
+
+
+def intern_aliases(aliases):
+    """Return a shared immutable tuple for a list of aliases.
+
+    Async friendly.
+    """
+    if not aliases:
+        return None
+    key = tuple(sys.intern(str(alias)) for alias in aliases)
+    return _ALIASES_CACHE.setdefault(key, key)
+
+
+def load_transport():
+    """Import Rflink transport libraries and return import time.
+
+    Not async friendly, run in executor.
+    """
+    start = time.monotonic()
+    import rflink.protocol  # noqa pylint: disable=unused-variable
+    import serial  # noqa pylint: disable=unused-variable
+    return time.monotonic() - start
+
 
 def identify_event_type(event):
     """Look at event to determine type of device.
@@ -109,8 +198,8 @@ def identify_event_type(event):
 
 async def async_setup(hass, config):
     """Set up the Rflink component."""
-    from rflink.protocol import create_rflink_connection
-    import serial
+    setup_start = time.monotonic()
+    _ALIASES_CACHE.clear()
 
     # Allow entities to register themselves by device_id to be looked up when
     # new rflink events arrive to be handled
@@ -125,6 +214,59 @@ async def async_setup(hass, config):
     # Allow platform to specify function to register new unknown devices
     hass.data[DATA_DEVICE_REGISTER] = {}
 
+    # Aggregation windows of sensors by device id, the sensor platform does
+    # not use device defaults
+    hass.data[DATA_AGGREGATE_WINDOWS] = config[DOMAIN][CONF_AGGREGATE_WINDOWS]
+
+    # Last sensor event of known and learned devices as [timestamp, event],
+    # persisted to skip unknown states after restart
+    store = Store(hass, STATE_CACHE_STORAGE_VERSION, STATE_CACHE_STORAGE_KEY)
+    sensor_cache = {}
+    cache_save_pending = False
+
+    def prune_cache(cache):
+        """Return cache without old events, newest events up to max size."""
+        oldest = time.time() - STATE_CACHE_MAX_AGE
+        entries = sorted(
+            ((event_id, entry) for event_id, entry in cache.items()
+             if entry[0] >= oldest),
+            key=lambda item: item[1][0], reverse=True)
+        return dict(entries[:STATE_CACHE_MAX_SIZE])
+
+    def cache_data():
+        """Return state cache data to be saved."""
+        nonlocal cache_save_pending, sensor_cache
+        cache_save_pending = False
+        sensor_cache = prune_cache(sensor_cache)
+        return {EVENT_KEY_SENSOR: sensor_cache}
+
+    @callback
+    def cache_sensor_event(event):
+        """Remember sensor event and schedule state cache save."""
+        nonlocal cache_save_pending
+        sensor_cache[event[EVENT_KEY_ID]] = [time.time(), event]
+        if not cache_save_pending:
+            cache_save_pending = True
+            store.async_delay_save(cache_data, STATE_CACHE_SAVE_DELAY)
+
+    async def async_restore_cache(*_):
+        """Replay cached sensor events to restore states and devices."""
+        data = await store.async_load()
+        if not data:
+            return
+
+        cache = prune_cache(data.get(EVENT_KEY_SENSOR, {}))
+        for event_id, entry in cache.items():
+            # Newer event received since startup
+            if event_id in sensor_cache:
+                continue
+            sensor_cache[event_id] = entry
+            _LOGGER.debug('restoring cached event: %s', entry[1])
+            # Flag keeps the restored value out of aggregation and the cache
+            event = dict(entry[1])
+            event[EVENT_KEY_RESTORED] = True
+            event_callback(event)
+
     async def async_send_command(call):
         """Send Rflink command."""
         _LOGGER.debug('Rflink command for %s', str(call.data))
@@ -137,6 +279,51 @@ async def async_setup(hass, config):
         DOMAIN, SERVICE_SEND_COMMAND, async_send_command,
         schema=SEND_COMMAND_SCHEMA)
 
+    async def async_send_commands(call):
+        """Send batch of Rflink commands in order."""
+        items = call.data[CONF_COMMANDS]
+        commands = []
+        # Index of sent command for every item, None if collapsed
+        sent_index = []
+        for item in items:
+            command = (item[CONF_DEVICE_ID], item[CONF_COMMAND],
+                       item[CONF_REPETITIONS])
+            # Consecutive entries for the same device, the last one wins
+            if commands and commands[-1][0] == command[0]:
+                sent_index[-1] = None
+                commands[-1] = command
+            else:
+                commands.append(command)
+            sent_index.append(len(commands) - 1)
+        duplicates = len(items) - len(commands)
+
+        _LOGGER.debug('Rflink batch of %s commands', len(commands))
+        start = time.monotonic()
+        results = await RflinkCommand.send_commands(commands)
+        duration = round(time.monotonic() - start, 3)
+
+        failed = results.count(False)
+        if failed:
+            _LOGGER.error('Failed %s of %s Rflink commands',
+                          failed, len(commands))
+
+        # One result for every submitted item, collapsed items are not sent
+        hass.bus.async_fire(EVENT_SEND_COMMANDS_RESULT, {
+            ATTR_RESULTS: [{
+                CONF_DEVICE_ID: item[CONF_DEVICE_ID],
+                CONF_COMMAND: item[CONF_COMMAND],
+                ATTR_SUCCESS: None if index is None else results[index],
+                ATTR_COLLAPSED: index is None,
+            } for item, index in zip(items, sent_index)],
+            ATTR_DURATION: duration,
+            ATTR_DUPLICATES: duplicates,
+            ATTR_FAILED: failed,
+        }, context=call.context)
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_SEND_COMMANDS, async_send_commands,
+        schema=SEND_COMMANDS_SCHEMA)
+
     @callback
     def event_callback(event):
         """Handle incoming Rflink events.
@@ -164,6 +351,12 @@ async def async_setup(hass, config):
         else:
             entity_ids = hass.data[DATA_ENTITY_LOOKUP][event_type][event_id]
 
+        if event_type == EVENT_KEY_SENSOR and \
+                not event.get(EVENT_KEY_RESTORED) and (
+                    entity_ids or
+                    event_type in hass.data[DATA_DEVICE_REGISTER]):
+            cache_sensor_event(event)
+
         _LOGGER.debug('entity_ids: %s', entity_ids)
         if entity_ids:
             # Propagate event to every entity matching the device id
@@ -209,6 +402,14 @@ async def async_setup(hass, config):
         """Set up connection and hook it into HA for reconnect/shutdown."""
         _LOGGER.info('Initiating Rflink connection')
 
+        # Transport libraries are loaded off the event loop when connecting,
+        # imports below are then only lookups of already loaded modules
+        import_time = await hass.async_add_executor_job(load_transport)
+        _LOGGER.debug('Rflink transport libraries loaded in %.3f s',
+                      import_time)
+        from rflink.protocol import create_rflink_connection
+        import serial
+
         # Rflink create_rflink_connection decides based on the value of host
         # (string or None) if serial or tcp mode should be used
 
@@ -254,9 +455,123 @@ async def async_setup(hass, config):
         _LOGGER.info('Connected to Rflink')
 
     hass.async_create_task(connect())
+
+    # Load state cache once all platforms are set up
+    if hass.state == CoreState.running:
+        hass.async_create_task(async_restore_cache())
+    else:
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_START,
+                                   async_restore_cache)
+
+    _LOGGER.debug('Rflink setup took %.3f s', time.monotonic() - setup_start)
     return True
 
 
+class SensorAggregate(object):
+    """Running statistics of sensor values over a tumbling window.
+
+    Keeps constant memory regardless of the number of received values.
+    """
+
+    __slots__ = ('count', 'min', 'max', 'mean', 'last', 'window',
+                 'timer')
+
+    def __init__(self, window):
+        """Initialize the aggregate with window length in seconds."""
+        self.window = window
+        self.timer = None
+        self.reset()
+
+    def reset(self):
+        """Start a new empty window."""
+        self.count = 0
+        self.min = None
+        self.max = None
+        self.mean = None
+        self.last = None
+
+    def add(self, value):
+        """Add value to the running statistics."""
+        self.count += 1
+        self.last = value
+        if self.count == 1:
+            self.min = self.max = self.mean = value
+            return
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.mean += (value - self.mean) / self.count
+
+    @property
+    def attributes(self):
+        """Return the statistics of the last published window."""
+        return {
+            ATTR_AGGREGATE_COUNT: self.count,
+            ATTR_AGGREGATE_MIN: self.min,
+            ATTR_AGGREGATE_MAX: self.max,
+            ATTR_AGGREGATE_LAST: self.last,
+        }
+
+
+class DimDebounce(object):
+    """Debounce config and state of a dimmer."""
+
+    __slots__ = ('delay', 'leading', 'trailing', 'timer', 'pending')
+
+    def __init__(self, delay, leading, trailing):
+        """Initialize with delay in seconds."""
+        self.delay = delay
+        self.leading = leading
+        self.trailing = trailing
+        self.timer = None
+        self.pending = None
+
+    def cancel(self):
+        """Cancel dim level waiting for debounce window to end."""
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        self.pending = None
+
+
+class CoverTracker(object):
+    """Shared timer updating position of all moving Rflink covers.
+
+    The timer runs only while at least one cover is moving.
+    """
+
+    def __init__(self, hass):
+        """Initialize the tracker."""
+        self.hass = hass
+        self.covers = set()
+        self._timer = None
+
+    @callback
+    def add(self, cover):
+        """Start tracking moving cover."""
+        self.covers.add(cover)
+        if self._timer is None:
+            self._timer = self.hass.loop.call_later(
+                COVER_TRACKER_INTERVAL, self._tick)
+
+    @callback
+    def remove(self, cover):
+        """Stop tracking cover."""
+        self.covers.discard(cover)
+
+    @callback
+    def _tick(self):
+        """Update positions and keep timer running for moving covers."""
+        self._timer = None
+        for cover in list(self.covers):
+            if not cover.cover_travel_tick():
+                self.covers.discard(cover)
+        if self.covers:
+            self._timer = self.hass.loop.call_later(
+                COVER_TRACKER_INTERVAL, self._tick)
+
+
 class RflinkDevice(Entity):
     """Representation of a Rflink device.
 
@@ -267,29 +582,68 @@ class RflinkDevice(Entity):
     _state = None
     _available = True
 
+    # Optional aggregation of high rate sensor values, set up from
+    # aggregate_windows component config
+    _aggregate = None
+    _aggregate_attrs = None
+
+    # Optional features, only devices using them get instance attributes
+    _dim_debounce = None
+    _travel_times = None
+
     def __init__(self, device_id, initial_event=None, name=None, aliases=None,
                  group=True, group_aliases=None, nogroup_aliases=None,
                  fire_event=False,
-                 signal_repetitions=DEFAULT_SIGNAL_REPETITIONS):
+                 signal_repetitions=DEFAULT_SIGNAL_REPETITIONS,
+                 dim_debounce=None,
+                 dim_debounce_leading=True, dim_debounce_trailing=True,
+                 travel_time_up=None, travel_time_down=None):
         """Initialize the device."""
         # Rflink specific attributes for every component type
         self._initial_event = initial_event
-        self._device_id = device_id
+        self._device_id = sys.intern(device_id)
         if name:
             self._name = name
         else:
-            self._name = device_id
+            self._name = self._device_id
 
-        self._aliases = aliases
+        self._aliases = intern_aliases(aliases)
         self._group = group
-        self._group_aliases = group_aliases
-        self._nogroup_aliases = nogroup_aliases
+        self._group_aliases = intern_aliases(group_aliases)
+        self._nogroup_aliases = intern_aliases(nogroup_aliases)
         self._should_fire_event = fire_event
         self._signal_repetitions = signal_repetitions
 
+        # Optional collapsing of rapid dim commands (eg: slider drag)
+        if dim_debounce:
+            if not (dim_debounce_leading or dim_debounce_trailing):
+                # No dim level would ever be sent
+                _LOGGER.warning('%s: %s and %s both disabled, enabling %s',
+                                device_id, CONF_DIM_DEBOUNCE_LEADING,
+                                CONF_DIM_DEBOUNCE_TRAILING,
+                                CONF_DIM_DEBOUNCE_TRAILING)
+                dim_debounce_trailing = True
+            self._dim_debounce = DimDebounce(
+                dim_debounce.total_seconds(), dim_debounce_leading,
+                dim_debounce_trailing)
+
+        # Optional time based position of UP/DOWN/STOP covers as
+        # (travel time up, travel time down) in seconds
+        if travel_time_up or travel_time_down:
+            travel_time_up = travel_time_up or travel_time_down
+            travel_time_down = travel_time_down or travel_time_up
+            self._travel_times = (travel_time_up.total_seconds(),
+                                  travel_time_down.total_seconds())
+
     @callback
     def handle_event_callback(self, event):
         """Handle incoming event for device type."""
+        # Restored values are published right away
+        if self._aggregate is not None and \
+                not event.get(EVENT_KEY_RESTORED) and \
+                self._aggregate_event(event):
+            return
+
         # Call platform specific event handler
         self._handle_event(event)
 
@@ -306,10 +660,48 @@ class RflinkDevice(Entity):
             _LOGGER.debug("Fired bus event for %s: %s",
                           self.entity_id, event[EVENT_KEY_COMMAND])
 
+    def _aggregate_event(self, event):
+        """Collect sensor value into the current window.
+
+        Return True if the event was consumed by the aggregation.
+        """
+        value = event.get(EVENT_KEY_VALUE)
+        if identify_event_type(event) != EVENT_KEY_SENSOR or \
+                isinstance(value, bool) or \
+                not isinstance(value, (int, float)):
+            return False
+
+        aggregate = self._aggregate
+        aggregate.add(value)
+        if aggregate.timer is None:
+            aggregate.timer = self.hass.loop.call_later(
+                aggregate.window, self._publish_aggregate, dict(event))
+        return True
+
+    @callback
+    def _publish_aggregate(self, event):
+        """Publish one state for the finished window."""
+        aggregate = self._aggregate
+        aggregate.timer = None
+        if not aggregate.count:
+            return
+
+        event[EVENT_KEY_VALUE] = round(aggregate.mean, 2)
+        self._aggregate_attrs = aggregate.attributes
+        aggregate.reset()
+
+        self._handle_event(event)
+        self.async_schedule_update_ha_state()
+
     def _handle_event(self, event):
         """Platform specific event handler."""
         raise NotImplementedError()
 
+    @property
+    def device_state_attributes(self):
+        """Return the statistics of the last aggregation window."""
+        return self._aggregate_attrs
+
     @property
     def should_poll(self):
         """No polling needed."""
@@ -381,9 +773,23 @@ class RflinkDevice(Entity):
                                  SIGNAL_HANDLE_EVENT.format(self.entity_id),
                                  self.handle_event_callback)
 
-        # Process the initial event now that the entity is created
-        if self._initial_event:
-            self.handle_event_callback(self._initial_event)
+        # Aggregation configured in component config by device id
+        window = self.hass.data.get(DATA_AGGREGATE_WINDOWS, {}).get(
+            self._device_id)
+        if window:
+            self._aggregate = SensorAggregate(window.total_seconds())
+
+        # Process the initial event now that the entity is created and drop
+        # the reference, it is not needed anymore
+        initial_event, self._initial_event = self._initial_event, None
+        if initial_event:
+            self.handle_event_callback(initial_event)
+
+    async def async_will_remove_from_hass(self):
+        """Cancel pending aggregation window."""
+        if self._aggregate is not None and self._aggregate.timer:
+            self._aggregate.timer.cancel()
+            self._aggregate.timer = None
 
 
 class RflinkCommand(RflinkDevice):
@@ -401,6 +807,15 @@ class RflinkCommand(RflinkDevice):
     # are sent
     _repetition_task = None
 
+    # Last dim level sent to avoid sending identical levels
+    _last_dim_level = None
+
+    # Cover position (0 closed - 100 open) and running travel as
+    # (start time, start position, direction, target position)
+    _position = None
+    _travel = None
+    _travel_stop = None
+
     _protocol = None
 
     @classmethod
@@ -420,9 +835,41 @@ class RflinkCommand(RflinkDevice):
         """Send device command to Rflink and wait for acknowledgement."""
         return await cls._protocol.send_command_ack(device_id, action)
 
+    @classmethod
+    async def send_commands(cls, commands):
+        """Send (device_id, action, repetitions) commands in order.
+
+        Return list of success flags, one for every command.
+        """
+        results = []
+        for device_id, action, repetitions in commands:
+            success = False
+            for _ in range(repetitions):
+                # Connection may get lost in the middle of the batch
+                if not cls.is_connected():
+                    success = False
+                    break
+                success = bool(
+                    await cls._protocol.send_command_ack(device_id, action))
+                if not success:
+                    break
+            results.append(success)
+        return results
+
     async def _async_handle_command(self, command, *args):
         """Do bookkeeping for command, send it to rflink and update state."""
+        if command == 'dim':
+            # convert brightness to rflink dim level
+            self._state = True
+            await self._async_handle_dim(str(int(args[0] / 17)))
+
+            # Update state of entity
+            await self.async_update_ha_state()
+            return
+
         self.cancel_queued_send_commands()
+        self.cancel_dim_debounce()
+        self._last_dim_level = None
 
         if command == 'turn_on':
             cmd = 'on'
@@ -432,11 +879,6 @@ class RflinkCommand(RflinkDevice):
             cmd = 'off'
             self._state = False
 
-        elif command == 'dim':
-            # convert brightness to rflink dim level
-            cmd = str(int(args[0] / 17))
-            self._state = True
-
         elif command == 'toggle':
             cmd = 'on'
             # if the state is unknown or false, it gets set as true
@@ -447,14 +889,26 @@ class RflinkCommand(RflinkDevice):
         elif command == 'close_cover':
             cmd = 'DOWN'
             self._state = False
+            self._cover_start_travel(0)
 
         elif command == 'open_cover':
             cmd = 'UP'
             self._state = True
+            self._cover_start_travel(100)
 
         elif command == 'stop_cover':
             cmd = 'STOP'
             self._state = True
+            self._cover_stop_travel()
+
+        elif command == 'set_cover_position':
+            # Timed STOP is sent by the cover tracker
+            direction = self._cover_start_travel(args[0])
+            if not direction:
+                await self.async_update_ha_state()
+                return
+            cmd = 'UP' if direction > 0 else 'DOWN'
+            self._state = args[0] > 0
 
         # Send initial command and queue repetitions.
         # This allows the entity state to be updated quickly and not having to
@@ -464,6 +918,235 @@ class RflinkCommand(RflinkDevice):
         # Update state of entity
         await self.async_update_ha_state()
 
+    async def _async_handle_dim(self, level):
+        """Send dim level, collapsing rapid changes if debounce is set."""
+        debounce = self._dim_debounce
+        if debounce is None:
+            await self._async_send_dim(level)
+            return
+
+        # Leading level is sent only if no debounce window is running
+        send_now = debounce.timer is None and debounce.leading
+        if debounce.timer is not None:
+            debounce.timer.cancel()
+        if not send_now:
+            # Latest level wins
+            debounce.pending = level
+        debounce.timer = self.hass.loop.call_later(
+            debounce.delay, self._dim_debounce_done)
+
+        if send_now:
+            await self._async_send_dim(level)
+
+    @callback
+    def _dim_debounce_done(self):
+        """Send trailing dim level once the changes have settled."""
+        debounce = self._dim_debounce
+        debounce.timer = None
+        level, debounce.pending = debounce.pending, None
+        if level is not None and debounce.trailing:
+            self.hass.async_create_task(self._async_send_trailing_dim(level))
+
+    async def _async_send_trailing_dim(self, level):
+        """Send trailing dim level, nobody awaits the result."""
+        try:
+            await self._async_send_dim(level)
+        except HomeAssistantError as exc:
+            _LOGGER.error("Failed to send dim level %s to %s: %s",
+                          level, self._device_id, exc)
+
+    async def _async_send_dim(self, level):
+        """Send dim level unless it is the same as the last one sent."""
+        if level == self._last_dim_level:
+            _LOGGER.debug("Skipping dim level %s already sent to %s",
+                          level, self._device_id)
+            return
+
+        self.cancel_queued_send_commands()
+        await self._async_send_command(level, self._signal_repetitions)
+        self._last_dim_level = level
+
+    def cancel_dim_debounce(self):
+        """Cancel dim level waiting for debounce window to end."""
+        if self._dim_debounce is not None:
+            self._dim_debounce.cancel()
+
+    async def async_will_remove_from_hass(self):
+        """Cancel pending dim command and cover tracking."""
+        await super().async_will_remove_from_hass()
+        self.cancel_dim_debounce()
+        self._cover_stop_travel()
+
+    async def async_added_to_hass(self):
+        """Restore estimated cover position."""
+        await super().async_added_to_hass()
+
+        if not self.tracks_position or not isinstance(self, RestoreEntity) \
+                or self._position is not None:
+            return
+
+        old_state = await self.async_get_last_state()
+        if old_state is None:
+            return
+        position = old_state.attributes.get(ATTR_CURRENT_POSITION)
+        if position is not None:
+            self._position = position
+        elif old_state.state == STATE_OPEN:
+            self._position = 100
+        elif old_state.state == STATE_CLOSED:
+            self._position = 0
+
+    @property
+    def tracks_position(self):
+        """Return True if cover position is estimated from travel time."""
+        return self._travel_times is not None
+
+    @property
+    def current_cover_position(self):
+        """Return estimated cover position, None if not tracked."""
+        if not self.tracks_position or self._position is None:
+            return None
+        return int(round(self._position))
+
+    def async_set_cover_position(self, **kwargs):
+        """Move the cover to a specific position."""
+        return self._async_handle_command(
+            'set_cover_position', kwargs[ATTR_POSITION])
+
+    @callback
+    def handle_event_callback(self, event):
+        """Track cover travel started by a remote."""
+        if self.tracks_position and \
+                identify_event_type(event) == EVENT_KEY_COMMAND:
+            command = event[EVENT_KEY_COMMAND]
+            if command in COVER_UP_COMMANDS:
+                self._cover_start_travel(100)
+            elif command in COVER_DOWN_COMMANDS:
+                self._cover_start_travel(0)
+            elif command in COVER_STOP_COMMANDS:
+                self._cover_stop_travel()
+
+        super().handle_event_callback(event)
+
+    def _cover_tracker(self):
+        """Return cover tracker shared by all covers."""
+        if DATA_COVER_TRACKER not in self.hass.data:
+            self.hass.data[DATA_COVER_TRACKER] = CoverTracker(self.hass)
+        return self.hass.data[DATA_COVER_TRACKER]
+
+    def _cover_position_now(self):
+        """Return cover position estimated at this moment."""
+        if self._travel is None:
+            return self._position
+
+        start, start_position, direction, _ = self._travel
+        travel_time = self._travel_times[0 if direction > 0 else 1]
+        moved = (self.hass.loop.time() - start) / travel_time * 100
+        return min(max(start_position + direction * moved, 0), 100)
+
+    def _cover_start_travel(self, target):
+        """Start tracking travel to target position.
+
+        Return travel direction, 1 up, -1 down or 0 if already there.
+        """
+        if not self.tracks_position:
+            return 0
+
+        position = self._cover_position_now()
+        if position is None:
+            # Unknown position, assume the cover has to travel all the way
+            if target in (0, 100):
+                position = 100 - target
+            else:
+                position = 100 if self._state else 0
+
+        if position == target:
+            self._cover_stop_travel()
+            return 0
+
+        self._cover_stop_travel()
+        direction = 1 if target > position else -1
+        self._position = position
+        self._travel = (self.hass.loop.time(), position, direction, target)
+        self._cover_tracker().add(self)
+
+        # Intermediate position is stopped exactly at the estimated arrival,
+        # end positions are stopped by the cover itself
+        if 0 < target < 100:
+            travel_time = self._travel_times[0 if direction > 0 else 1]
+            self._travel_stop = self.hass.loop.call_later(
+                abs(target - position) / 100 * travel_time,
+                self._cover_finish_travel)
+        return direction
+
+    def _cover_stop_travel(self):
+        """Stop tracking travel at the current position."""
+        if self._travel_stop is not None:
+            self._travel_stop.cancel()
+            self._travel_stop = None
+        if self._travel is None:
+            return
+        self._position = self._cover_position_now()
+        self._travel = None
+        self._cover_tracker().remove(self)
+
+    @callback
+    def _cover_finish_travel(self):
+        """Set target position or send STOP for intermediate target."""
+        start, start_position, direction, target = self._travel
+        self._travel_stop = None
+        if 0 < target < 100:
+            # Cover keeps moving until STOP is sent, track it towards the end
+            # position meanwhile
+            self._travel = (start, start_position, direction,
+                            100 if direction > 0 else 0)
+            self.hass.async_create_task(
+                self._async_cover_send_stop(self._travel, target))
+            return
+
+        self._cover_stop_travel()
+        self._position = target
+        self._state = target > 0
+        self.async_schedule_update_ha_state()
+
+    async def _async_cover_send_stop(self, travel, target):
+        """Send STOP and set target position once it was sent."""
+        self.cancel_queued_send_commands()
+        try:
+            await self._async_send_command('STOP', self._signal_repetitions)
+        except HomeAssistantError as exc:
+            _LOGGER.error("Failed to stop %s at position %s: %s",
+                          self._device_id, target, exc)
+            return
+
+        # Travel changed by another command meanwhile
+        if self._travel is not travel:
+            return
+        self._cover_stop_travel()
+        self._position = target
+        self._state = target > 0
+        self.async_schedule_update_ha_state()
+
+    @callback
+    def cover_travel_tick(self):
+        """Update position of moving cover.
+
+        Return True while the cover is still moving.
+        """
+        position = self._cover_position_now()
+        _, _, direction, target = self._travel
+        if (position - target) * direction >= 0:
+            self._cover_finish_travel()
+            return self._travel is not None
+
+        # State is written only on every COVER_STATE_STEP % of travel
+        previous, self._position = self._position, position
+        if previous is None or \
+                int(previous // COVER_STATE_STEP) != \
+                int(position // COVER_STATE_STEP):
+            self.async_schedule_update_ha_state()
+        return True
+
     def cancel_queued_send_commands(self):
         """Cancel queued signal repetition commands.
 
@@ -513,6 +1196,8 @@ class SwitchableRflinkDevice(RflinkCommand, RestoreEntity):
     def _handle_event(self, event):
         """Adjust state if Rflink picks up a remote command for this device."""
         self.cancel_queued_send_commands()
+        # Remote may have changed the dim level
+        self._last_dim_level = None
 
         command = event['command']
         if command in ['on', 'allon']:
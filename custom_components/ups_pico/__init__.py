@@ -6,12 +6,20 @@ at https://home-assistant.io/components/
 """
 import asyncio
 import logging
+import time
 
-# import voluptuous as vol
+import async_timeout
+import voluptuous as vol
 
+from homeassistant.const import CONF_SERVICE
+from homeassistant.core import callback
+import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.entity_component import EntityComponent
-from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.event import (
+    async_call_later, async_track_time_interval)
+
+from . import i2c
 
 REQUIREMENTS = ['smbus2==0.2.0']
 
@@ -21,6 +29,28 @@ DOMAIN = 'ups_pico'
 SENSOR_ID_FORMAT = DOMAIN + '.{}'
 SWITCH_NAME_FORMAT = DOMAIN + ' {}'
 
+I2C_BUS = 1
+
+CONF_BATTERY_HYSTERESIS = 'battery_hysteresis'
+CONF_BATTERY_LOW = 'battery_low'
+CONF_SHUTDOWN = 'shutdown'
+CONF_SHUTDOWN_DELAY = 'delay'
+
+DEFAULT_BATTERY_HYSTERESIS = 0.1
+DEFAULT_SHUTDOWN_SERVICE = 'homeassistant.stop'
+
+EVENT_BATTERY_LOW = DOMAIN + '_battery_low'
+EVENT_BATTERY_OK = DOMAIN + '_battery_ok'
+EVENT_POWER_LOST = DOMAIN + '_power_lost'
+EVENT_POWER_RESTORED = DOMAIN + '_power_restored'
+EVENT_SHUTDOWN = DOMAIN + '_shutdown'
+
+ATTR_SHUTDOWN_IN = 'shutdown_in'
+
+PWR_MODE_UPS = 'UPS powered'
+
+FIRST_READ_TIMEOUT = 10
+
 SENSOR_TYPES = {
     'volt_bat': ['BAT Voltage', 'V', 'battery'],
     'volt_rpi': ['RPi Voltage', 'V', 'power-plug'],
@@ -34,18 +64,34 @@ SWITCH_TYPES = {
     'led_enable': ['Enabled LEDs', 'led-off']
 }
 
+CONFIG_SCHEMA = vol.Schema({
+    DOMAIN: vol.All(lambda value: value or {}, vol.Schema({
+        vol.Optional(CONF_BATTERY_LOW): vol.Coerce(float),
+        vol.Optional(CONF_BATTERY_HYSTERESIS,
+                     default=DEFAULT_BATTERY_HYSTERESIS):
+            vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional(CONF_SHUTDOWN): vol.Schema({
+            vol.Required(CONF_SHUTDOWN_DELAY):
+                vol.All(cv.time_period, cv.positive_timedelta),
+            vol.Optional(CONF_SERVICE,
+                         default=DEFAULT_SHUTDOWN_SERVICE): cv.service,
+        }),
+    })),
+}, extra=vol.ALLOW_EXTRA)
+
 UPS_DATA = None
 
 
-@asyncio.coroutine
-def async_setup(hass, config):
+async def async_setup(hass, config):
     """Set up the UPS PIco component."""
+    setup_start = time.monotonic()
     component = EntityComponent(_LOGGER, DOMAIN, hass)
     entities = []
 
+    # Bus is opened and read in the background, entities are unavailable
+    # until the first read succeeds
     global UPS_DATA
     UPS_DATA = UpsPico()
-    UPS_DATA.get_data()
 
     for object_id, cfg in SENSOR_TYPES.items():
         name = cfg[0]
@@ -57,10 +103,83 @@ def async_setup(hass, config):
     if not entities:
         return False
 
-    async_track_time_interval(hass, UPS_DATA.async_update,
+    conf = config.get(DOMAIN) or {}
+    edges = UpsPicoEdges(conf.get(CONF_BATTERY_LOW),
+                         conf.get(CONF_BATTERY_HYSTERESIS,
+                                  DEFAULT_BATTERY_HYSTERESIS))
+    shutdown_conf = conf.get(CONF_SHUTDOWN)
+    cancel_shutdown = None
+
+    async def async_shutdown(*_):
+        """Shut down after power loss."""
+        nonlocal cancel_shutdown
+        cancel_shutdown = None
+        _LOGGER.warning('UPS PIco shutting down, calling %s',
+                        shutdown_conf[CONF_SERVICE])
+        hass.bus.async_fire(EVENT_SHUTDOWN)
+        domain, service = shutdown_conf[CONF_SERVICE].split('.', 1)
+        await hass.services.async_call(domain, service)
+
+    @callback
+    def async_power_event(event_type):
+        """Fire power event and run built-in shutdown countdown."""
+        nonlocal cancel_shutdown
+        data = {
+            'pwr_mode': UPS_DATA.pico_data.get('pwr_mode'),
+            'volt_bat': UPS_DATA.pico_data.get('volt_bat'),
+        }
+
+        if shutdown_conf and event_type == EVENT_POWER_LOST and \
+                cancel_shutdown is None:
+            delay = shutdown_conf[CONF_SHUTDOWN_DELAY].total_seconds()
+            data[ATTR_SHUTDOWN_IN] = delay
+            _LOGGER.warning('UPS PIco power lost, shutting down in %s s',
+                            delay)
+            cancel_shutdown = async_call_later(hass, delay, async_shutdown)
+        elif shutdown_conf and event_type == EVENT_POWER_RESTORED and \
+                cancel_shutdown is not None:
+            _LOGGER.warning('UPS PIco power restored, shutdown cancelled')
+            cancel_shutdown()
+            cancel_shutdown = None
+        elif shutdown_conf and event_type == EVENT_BATTERY_LOW and \
+                cancel_shutdown is not None:
+            # No time left to wait for the countdown
+            cancel_shutdown()
+            hass.async_create_task(async_shutdown())
+
+        _LOGGER.debug('UPS PIco event %s: %s', event_type, data)
+        hass.bus.async_fire(event_type, data)
+
+    async def async_update_data(*_):
+        """Read latest data from UPS PIco in executor."""
+        if not await hass.async_add_executor_job(UPS_DATA.get_data):
+            return
+
+        # Fire power events right away, not on entity state change
+        for event_type in edges.process(UPS_DATA.pico_data):
+            async_power_event(event_type)
+
+    async def async_first_update():
+        """Do the first read and make entities available."""
+        try:
+            with async_timeout.timeout(FIRST_READ_TIMEOUT, loop=hass.loop):
+                await async_update_data()
+        except asyncio.TimeoutError:
+            _LOGGER.warning('Timeout reading UPS PIco, retrying in %s',
+                            component.scan_interval)
+            return
+
+        for entity in entities:
+            entity.async_schedule_update_ha_state(True)
+
+    await component.async_add_entities(entities)
+
+    async_track_time_interval(hass, async_update_data,
                               component.scan_interval)
+    hass.async_create_task(async_first_update())
 
-    yield from component.async_add_entities(entities)
+    _LOGGER.debug('UPS PIco setup took %.3f s',
+                  time.monotonic() - setup_start)
     return True
 
 
@@ -73,7 +192,7 @@ class UpsPicoSensor(Entity):
         self.entity_id = SENSOR_ID_FORMAT.format(object_id)
         self._object_id = object_id
         self._name = name
-        self._state = self.ups_pico.pico_data[self._object_id] or None
+        self._state = self.ups_pico.pico_data.get(self._object_id)
         self._unit_of_measurement = unit
         self._icon = icon
 
@@ -102,22 +221,64 @@ class UpsPicoSensor(Entity):
         """No polling needed."""
         return True
 
+    @property
+    def available(self):
+        """Return True if UPS PIco data has been read."""
+        return self.ups_pico.available
+
     @property
     def state_attributes(self):
         """Return the state attributes of the UPS."""
         if self._object_id == 'pwr_mode':
             attrs = {
-                'pwr_runtime': self.ups_pico.pico_data['pwr_runtime'],
-                'ver_pcb': self.ups_pico.pico_data['ver_pcb'],
-                'ver_boot': self.ups_pico.pico_data['ver_boot'],
-                'ver_fw': self.ups_pico.pico_data['ver_fw'],
+                'pwr_runtime': self.ups_pico.pico_data.get('pwr_runtime'),
+                'ver_pcb': self.ups_pico.pico_data.get('ver_pcb'),
+                'ver_boot': self.ups_pico.pico_data.get('ver_boot'),
+                'ver_fw': self.ups_pico.pico_data.get('ver_fw'),
+                'i2c_clients': self.ups_pico.bus.client_stats(),
             }
             return attrs
         return None
 
     def update(self):
         """Update sensor state."""
-        self._state = self.ups_pico.pico_data[self._object_id]
+        self._state = self.ups_pico.pico_data.get(self._object_id)
+
+
+class UpsPicoEdges(object):
+    """Class for detecting power and battery changes in UPS PIco data."""
+
+    def __init__(self, battery_low=None, hysteresis=0):
+        """Initialize class."""
+        self.battery_low = battery_low
+        self.hysteresis = hysteresis
+        self.on_battery = None
+        self.low_battery = False
+
+    def process(self, data):
+        """Return list of events for changes since the last data."""
+        events = []
+
+        on_battery = data.get('pwr_mode') == PWR_MODE_UPS
+        if on_battery != self.on_battery:
+            # Power restored is not reported for the first reading
+            if on_battery:
+                events.append(EVENT_POWER_LOST)
+            elif self.on_battery is not None:
+                events.append(EVENT_POWER_RESTORED)
+            self.on_battery = on_battery
+
+        volt_bat = data.get('volt_bat')
+        if self.battery_low is not None and volt_bat is not None:
+            if not self.low_battery and volt_bat < self.battery_low:
+                self.low_battery = True
+                events.append(EVENT_BATTERY_LOW)
+            elif self.low_battery and \
+                    volt_bat >= self.battery_low + self.hysteresis:
+                self.low_battery = False
+                events.append(EVENT_BATTERY_OK)
+
+        return events
 
 
 class UpsPico(object):
@@ -125,11 +286,10 @@ class UpsPico(object):
 
     def __init__(self):
         """Initialize class."""
-        import smbus2
-
         self.pico_reg = dict()
         self.pico_data = dict()
-        self.i2c = smbus2.SMBus(1)
+        self.available = False
+        self.bus = i2c.get_bus(I2C_BUS)
         self.reg_dict = {
             "led_orange": 0x09,
             "led_green": 0x0a,
@@ -138,20 +298,16 @@ class UpsPico(object):
         }
         return
 
-    @asyncio.coroutine
-    def async_update(self, *_):
-        """Async update latest data."""
-        self.get_data()
-
     def _try_get_data(self):
         try:
-            reg = self.i2c.read_i2c_block_data(0x69, 0, 0x1d)
-            reg += [0xff, 0xff, 0xff]
-            reg += (self.i2c.read_i2c_block_data(0x69, 0x20, 7))
+            # All registers are read in one bus transaction
+            with self.bus.transaction(DOMAIN) as bus:
+                reg = bus.read_i2c_block_data(0x69, 0, 0x1d)
+                reg += [0xff, 0xff, 0xff]
+                reg += (bus.read_i2c_block_data(0x69, 0x20, 7))
+                reg_6b = bus.read_i2c_block_data(0x6b, 0, 0x16)
             self.pico_reg[0x69] = reg
-
-            reg = self.i2c.read_i2c_block_data(0x6b, 0, 0x16)
-            self.pico_reg[0x6b] = reg
+            self.pico_reg[0x6b] = reg_6b
 
         except Exception as exc:
             _LOGGER.error('Except class UPS PIco _try_get_data(): ' + str(exc))
@@ -165,7 +321,8 @@ class UpsPico(object):
         if device in self.reg_dict:
             reg = self.reg_dict[device]
             try:
-                self.i2c.write_byte_data(addr, reg, data)
+                with self.bus.transaction(DOMAIN) as bus:
+                    bus.write_byte_data(addr, reg, data)
                 self.pico_data[device] = data
                 _LOGGER.debug("Setting i2c addr %s %s to %s", addr, reg, data)
                 return True
@@ -193,6 +350,7 @@ class UpsPico(object):
         result = self._try_get_data()
 
         if not result:
+            self.available = False
             return False
 
         # *** 0x69 registers
@@ -255,4 +413,6 @@ class UpsPico(object):
         # 0x6b 0x15 Enable LEDs
         self.pico_data["led_enable"] = data[0x15]
 
+        # Available only once all data is parsed
+        self.available = True
         return True
@@ -0,0 +1,102 @@
+"""
+Shared i2c bus access for UPS PIco and other i2c clients.
+
+Every bus is opened once per process and accessed in transactions. A
+transaction holds the bus exclusively, waiting clients are served in the
+order they asked for the bus and time spent on the bus is accounted per
+client. A client waiting longer than the timeout gets TimeoutError.
+"""
+from contextlib import contextmanager
+import logging
+import threading
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+BUS_TIMEOUT = 5
+
+_BUSES = dict()
+_BUSES_LOCK = threading.Lock()
+
+
+def get_bus(bus_id):
+    """Return shared i2c bus, created on first use."""
+    with _BUSES_LOCK:
+        if bus_id not in _BUSES:
+            _BUSES[bus_id] = I2cBus(bus_id)
+        return _BUSES[bus_id]
+
+
+class I2cBus(object):
+    """Class for shared i2c bus with fair locking."""
+
+    def __init__(self, bus_id):
+        """Initialize class."""
+        self.bus_id = bus_id
+        self._stats = dict()
+        self._smbus = None
+        self._cond = threading.Condition()
+        self._next_ticket = 0
+        self._serving = 0
+        self._abandoned = set()
+
+    def _acquire(self, timeout):
+        """Wait for the bus in order of arrival."""
+        with self._cond:
+            ticket = self._next_ticket
+            self._next_ticket += 1
+            deadline = time.monotonic() + timeout
+            while ticket != self._serving:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    # Skip this ticket when its turn comes
+                    self._abandoned.add(ticket)
+                    raise TimeoutError(
+                        'i2c bus {} busy for {} s'.format(
+                            self.bus_id, timeout))
+                self._cond.wait(remaining)
+
+    def _release(self):
+        """Pass the bus to the next waiting client."""
+        with self._cond:
+            self._serving += 1
+            while self._serving in self._abandoned:
+                self._abandoned.remove(self._serving)
+                self._serving += 1
+            self._cond.notify_all()
+
+    def client_stats(self):
+        """Return transactions and seconds on the bus per client."""
+        with self._cond:
+            return {
+                client: {'transactions': count, 'bus_time': round(total, 3)}
+                for client, (count, total) in self._stats.items()
+            }
+
+    def _open(self):
+        """Open bus on first transaction."""
+        if self._smbus is None:
+            start = time.monotonic()
+            import smbus2
+
+            self._smbus = smbus2.SMBus(self.bus_id)
+            _LOGGER.debug("i2c bus %s opened in %.3f s",
+                          self.bus_id, time.monotonic() - start)
+        return self._smbus
+
+    @contextmanager
+    def transaction(self, client, timeout=BUS_TIMEOUT):
+        """Hold the bus exclusively for a batch of operations.
+
+        Yields the smbus2.SMBus handle.
+        """
+        self._acquire(timeout)
+        start = time.monotonic()
+        try:
+            yield self._open()
+        finally:
+            elapsed = time.monotonic() - start
+            with self._cond:
+                count, total = self._stats.get(client, (0, 0.0))
+                self._stats[client] = (count + 1, total + elapsed)
+            self._release()
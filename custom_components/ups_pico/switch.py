@@ -4,7 +4,6 @@ UPS PIco switch platform.
 For more details about this component, please refer to the documentation
 at https://home-assistant.io/components/
 """
-import asyncio
 import logging
 
 # import voluptuous as vol
@@ -17,8 +16,8 @@ DEPENDENCIES = ['ups_pico']
 _LOGGER = logging.getLogger(__name__)
 
 
-@asyncio.coroutine
-def async_setup_platform(hass, config, async_add_devices, discovery_info=None):
+async def async_setup_platform(hass, config, async_add_devices,
+                               discovery_info=None):
     """Set up the UPS PIco platform."""
     entities = []
 
@@ -66,6 +65,11 @@ class UpsPicoSwitch(SwitchDevice):
         """No polling needed."""
         return True
 
+    @property
+    def available(self):
+        """Return True if UPS PIco data has been read."""
+        return self.ups_pico.available
+
     def turn_on(self, **kwargs):
         """Turn the device on."""
         self.ups_pico.led_on(self._object_id)
@@ -80,4 +84,4 @@ class UpsPicoSwitch(SwitchDevice):
 
     def update(self):
         """Update switch state."""
-        self._state = self.ups_pico.pico_data[self._object_id]
+        self._state = self.ups_pico.pico_data.get(self._object_id)
@@ -0,0 +1,106 @@
+"""
+Measure memory used per rflink2 entity.
+
+Builds N switch and N sensor entities with the rflink2 component from a
+git revision (baseline) and from the working tree and reports bytes per
+entity measured with tracemalloc. Entities are only constructed, the
+release of the initial event happens when an entity is added to Home
+Assistant and is reported separately as the size of one event.
+
+Run from the repository root with the Home Assistant virtualenv active:
+
+    python scripts/benchmark_memory.py [baseline revision] [N]
+"""
+import os
+import subprocess
+import sys
+import tracemalloc
+import types
+
+COMPONENT = os.path.join('custom_components', 'rflink2.py')
+
+# Real installations share a few alias lists between many devices
+ALIASES = [
+    ['newkaku_0000c6c2_all', 'newkaku_0000c6c2_10'],
+    ['newkaku_0000c6c3_all'],
+    ['ev1527_0001e2_all', 'ev1527_0001e3_all', 'ev1527_0001e4_all'],
+]
+
+
+def load_component(name, source):
+    """Return component module built from source."""
+    module = types.ModuleType(name)
+    module.__file__ = COMPONENT
+    sys.modules[name] = module
+    exec(compile(source, COMPONENT, 'exec'), module.__dict__)
+    return module
+
+
+def build_entities(module, count):
+    """Return list of switch and sensor entities."""
+
+    class Switch(module.SwitchableRflinkDevice):
+        """Minimal switch entity."""
+
+    class Sensor(module.RflinkDevice):
+        """Minimal sensor entity."""
+
+        def _handle_event(self, event):
+            """Ignore events."""
+
+    entities = []
+    for index in range(count):
+        device_id = 'newkaku_{:08x}_1'.format(index)
+        entities.append(Switch(
+            device_id, aliases=list(ALIASES[index % len(ALIASES)]),
+            initial_event={'id': device_id, 'command': 'on'}))
+
+        device_id = 'alectov1_{:04x}_temp'.format(index)
+        entities.append(Sensor(
+            device_id, initial_event={
+                'id': device_id, 'sensor': 'temperature',
+                'value': 21.5, 'unit': '°C'}))
+    return entities
+
+
+def measure(module, count):
+    """Return bytes per entity."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    entities = build_entities(module, count)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    size = sum(stat.size_diff for stat in after.compare_to(before, 'lineno'))
+    return size / len(entities)
+
+
+def main():
+    """Print bytes per entity for baseline and working tree."""
+    revision = sys.argv[1] if len(sys.argv) > 1 else 'HEAD'
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 1500
+
+    baseline = subprocess.run(
+        ['git', 'show', '{}:{}'.format(revision, COMPONENT)],
+        stdout=subprocess.PIPE, check=True, universal_newlines=True).stdout
+    with open(COMPONENT) as source:
+        current = source.read()
+
+    results = [
+        (revision, measure(load_component('rflink2_baseline', baseline),
+                           count)),
+        ('working tree', measure(load_component('rflink2_current', current),
+                                 count)),
+    ]
+
+    event = {'id': 'alectov1_0000_temp', 'sensor': 'temperature',
+             'value': 21.5, 'unit': '°C'}
+    print('{} switch and {} sensor entities'.format(count, count))
+    for name, size in results:
+        print('{:<20} {:>8.0f} bytes per entity'.format(name, size))
+    print('{:<20} {:>8} bytes per entity, released when added'.format(
+        'initial event', sys.getsizeof(event)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Measure import time added to Home Assistant bootstrap by the components.
+
+Every module is imported in a fresh interpreter after the Home Assistant
+modules which are loaded during bootstrap anyway, so only the time added
+by the module itself is reported. Transport libraries are measured
+separately, they are loaded on connect/first bus access, not on setup.
+
+Run from the Home Assistant config directory (the one containing
+custom_components) with the Home Assistant virtualenv active:
+
+    python scripts/benchmark_startup.py
+"""
+import os
+import subprocess
+import sys
+
+RUNS = 5
+
+BOOTSTRAP_MODULES = [
+    'homeassistant.core',
+    'homeassistant.helpers.config_validation',
+    'homeassistant.helpers.entity',
+    'homeassistant.helpers.entity_component',
+    'homeassistant.helpers.restore_state',
+    'homeassistant.helpers.storage',
+]
+
+COMPONENTS = {
+    'rflink2': {
+        'component': 'custom_components.rflink2',
+        'transport': ['rflink.protocol', 'serial'],
+    },
+    'ups_pico': {
+        'component': 'custom_components.ups_pico',
+        'transport': ['smbus2'],
+    },
+}
+
+TIMER = """
+import importlib
+import time
+for name in {preload!r}:
+    importlib.import_module(name)
+start = time.perf_counter()
+for name in {modules!r}:
+    importlib.import_module(name)
+print(time.perf_counter() - start)
+"""
+
+
+def time_import(modules, preload):
+    """Return best import time of modules in seconds, None on error."""
+    code = TIMER.format(modules=modules, preload=preload)
+    best = None
+    for _ in range(RUNS):
+        result = subprocess.run(
+            [sys.executable, '-c', code], cwd=os.getcwd(),
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            universal_newlines=True)
+        if result.returncode:
+            print(result.stderr.strip().splitlines()[-1], file=sys.stderr)
+            return None
+        elapsed = float(result.stdout)
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def main():
+    """Print import time per component."""
+    print('{:<10} {:>14} {:>14}'.format(
+        'component', 'import [ms]', 'transport [ms]'))
+    for name, modules in COMPONENTS.items():
+        component = time_import([modules['component']], BOOTSTRAP_MODULES)
+        transport = time_import(modules['transport'], BOOTSTRAP_MODULES)
+        print('{:<10} {:>14} {:>14}'.format(
+            name,
+            '-' if component is None else '{:.1f}'.format(component * 1000),
+            '-' if transport is None else '{:.1f}'.format(transport * 1000)))
+
+
+if __name__ == '__main__':
+    main()